@@ -6,7 +6,14 @@ Installer for lockstr command
 import os
 import sys
 import platform
-import shutil
+import tempfile
+import zipfile
+
+
+# Resolved once; both are looked up from several places below
+_SYSTEM = platform.system()
+_IS_WIN = _SYSTEM == "Windows"
+_PYTHON = sys.executable
 
 
 def check_dependencies():
@@ -26,9 +33,9 @@ def check_dependencies():
         for package in missing:
             print(f"  ✗ {package}")
         
-        print(f"\nInstall with: {sys.executable} -m pip install {' '.join(missing)}")
+        print(f"\nInstall with: {_PYTHON} -m pip install {' '.join(missing)}")
         
-        if platform.system() == "Linux":
+        if _SYSTEM == "Linux":
             print("\n📋 Linux clipboard support (optional but recommended):")
             print("  For X11:      sudo apt install xclip")
             print("  For Wayland:  sudo apt install wl-clipboard")
@@ -40,10 +47,8 @@ def check_dependencies():
 
 def get_install_dir():
     """Get appropriate installation directory"""
-    system = platform.system()
-    
-    if system == "Windows":
-        python_dir = os.path.dirname(sys.executable)
+    if _IS_WIN:
+        python_dir = os.path.dirname(_PYTHON)
         scripts_dir = os.path.join(python_dir, "Scripts")
         if os.path.exists(scripts_dir):
             return scripts_dir
@@ -73,37 +78,87 @@ def check_in_path(directory):
     return directory in path_dirs
 
 
-def create_wrapper(install_dir, script_path):
-    """Create platform-specific wrapper"""
-    system = platform.system()
-    
-    if system == "Windows":
-        wrapper = os.path.join(install_dir, "lockstr.bat")
-        content = f'''@echo off
-"{sys.executable}" "{script_path}" %*
-'''
-        with open(wrapper, "w", encoding="utf-8") as f:
-            f.write(content)
-        return wrapper
+# Entry point of the zipapp. lockstr itself is stored as lockstr.py so that
+# worker processes started with spawn/forkserver can import the pickled
+# lockstr._init_worker/_process_worker; the guard keeps those workers
+# (which import this file as __mp_main__) from running the CLI again
+ZIPAPP_MAIN = """\
+import lockstr
+
+if __name__ == "__main__":
+    lockstr.run_cli()
+"""
+
+# Used in the shebang when the interpreter path cannot be written there
+FALLBACK_INTERPRETER = "/usr/bin/env python3"
+
+
+def get_interpreter():
+    """Interpreter for the zipapp shebang (no quoting is possible there)"""
+    if any(c.isspace() for c in _PYTHON):
+        print(f"⚠️  {_PYTHON} contains spaces and cannot be used in a shebang")
+        print(f"   Using '{FALLBACK_INTERPRETER}' instead; make sure it has the dependencies")
+        return FALLBACK_INTERPRETER
+    return _PYTHON
+
+
+def build_zipapp(install_dir, script_path):
+    """
+    Bundle lockstr into a single executable zipapp (lockstr.pyz on Windows)
+    The archive is written to a temporary file and renamed into place, so an
+    interrupted install never replaces a working lockstr with a broken one
+    """
+    target = os.path.join(install_dir, "lockstr.pyz" if _IS_WIN else "lockstr")
+    shebang = f"#!{get_interpreter()}\n".encode(sys.getfilesystemencoding())
     
-    else:
-        wrapper = os.path.join(install_dir, "lockstr")
-        content = f'''#!/bin/sh
-"{sys.executable}" "{script_path}" "$@"
-'''
-        with open(wrapper, "w", encoding="utf-8") as f:
-            f.write(content)
-        os.chmod(wrapper, 0o755)
-        return wrapper
+    fd, tmp_path = tempfile.mkstemp(prefix=".lockstr-", suffix=".tmp", dir=install_dir)
+    try:
+        with open(fd, "wb") as archive:
+            archive.write(shebang)
+            with zipfile.ZipFile(archive, "w") as bundle:
+                bundle.write(script_path, "lockstr.py")
+                bundle.writestr("__main__.py", ZIPAPP_MAIN)
+        
+        if not _IS_WIN:
+            os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return target
+
+
+def remove_stale_files(install_dir, main_script):
+    """Remove the script copy and wrapper left by older installers"""
+    stale = ["lockstr.py", "lockstr.bat"] if _IS_WIN else ["lockstr.py"]
+    for name in stale:
+        path = os.path.join(install_dir, name)
+        if not os.path.exists(path):
+            continue
+        if os.path.samefile(path, main_script):
+            # Installing from inside the install directory: that is the source
+            continue
+        os.remove(path)
+        print(f"✓ Removed old {path}")
+
+
+def check_pathext():
+    """On Windows, .pyz files only run by name if PATHEXT lists them"""
+    pathext = os.environ.get("PATHEXT", "").upper().split(os.pathsep)
+    if ".PYZ" not in pathext:
+        print("\n⚠️  .PYZ is not in PATHEXT, so 'lockstr' alone will not be found")
+        print('   Run: setx PATHEXT "%PATHEXT%;.PYZ" and restart your terminal')
+        print("   (until then, use: lockstr.pyz)")
 
 
 def add_to_path(install_dir):
     """Instructions for adding directory to PATH"""
-    system = platform.system()
-    
     print(f"\n⚠️  {install_dir} is not in your PATH")
     
-    if system == "Windows":
+    if _IS_WIN:
         print(f"\nTo add to PATH permanently:")
         print(f"1. Press Win + X, select 'System'")
         print(f"2. Click 'Advanced system settings'")
@@ -112,7 +167,7 @@ def add_to_path(install_dir):
         print(f"5. Click 'Edit' and add: {install_dir}")
         print(f"6. Restart your terminal")
     
-    elif system == "Darwin":
+    elif _SYSTEM == "Darwin":
         shell = os.environ.get("SHELL", "").split("/")[-1]
         rc_file = "~/.zshrc" if shell == "zsh" else "~/.bash_profile"
         
@@ -148,7 +203,7 @@ def main():
         response = input("Install now? [Y/n]: ").strip().lower()
         if response in ('', 'y', 'yes'):
             for package in ['cryptography', 'pyperclip']:
-                os.system(f"{sys.executable} -m pip install {package}")
+                os.system(f"{_PYTHON} -m pip install {package}")
         else:
             sys.exit(1)
     
@@ -164,17 +219,17 @@ def main():
     
     os.makedirs(install_dir, exist_ok=True)
     
-    dest_script = os.path.join(install_dir, "lockstr.py")
     try:
-        shutil.copy2(main_script, dest_script)
-        print(f"✓ Script copied to {dest_script}")
+        app = build_zipapp(install_dir, main_script)
+        print(f"✓ Executable created: {app}")
+        remove_stale_files(install_dir, main_script)
     except PermissionError:
         print(f"\nPermission denied: {install_dir}")
         print("Try: sudo python install_lockstr.py")
         sys.exit(1)
     
-    wrapper = create_wrapper(install_dir, dest_script)
-    print(f"✓ Wrapper created: {wrapper}")
+    if _IS_WIN:
+        check_pathext()
     
     if check_in_path(install_dir):
         print(f"\n✅ Installation complete!")
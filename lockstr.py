@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 """
-lockstr - File encryption/decryption tool using Fernet cryptography
+lockstr - File encryption/decryption tool using AES-256-GCM cryptography
 """
 
 import os
 import sys
+import stat
+import struct
+import base64
 import argparse
+import mmap
 import tempfile
+import threading
+from contextlib import contextmanager, redirect_stdout
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Dict, Union
 
-from cryptography.fernet import Fernet, InvalidToken
-import pyperclip
-from getpass import getpass
+# cryptography, pyperclip, getpass and concurrent.futures are imported
+# where they are used so that help and early error paths start fast
 
 
 BANNER = r"""
@@ -24,32 +29,103 @@ BANNER = r"""
 """
 
 # Magic header to identify lockstr-encrypted files
-MAGIC_HEADER = b"LOCKSTR1\x00"
+MAGIC_HEADER = b"LOCKSTR3\x00"
 MAGIC_LENGTH = len(MAGIC_HEADER)
 
+# Header of files written by older versions: followed by a raw Fernet token
+LEGACY_MAGIC_HEADER = b"LOCKSTR1\x00"
+
+# Framed AES-GCM container:
+#   MAGIC || salt || chunk_size_u32, then for every CHUNK_SIZE piece
+#   nonce || length_u32 || ciphertext || tag
+# with nonce = salt || counter_u32 and AAD = length_u32 || final flag,
+# so frames are self-describing and truncation or reordering fails
+CHUNK_SIZE = 1024 * 1024
+SALT_LENGTH = 8
+NONCE_LENGTH = 12
+GCM_TAG_LENGTH = 16
+U32 = struct.Struct(">I")
+CONTAINER_HEADER_LENGTH = SALT_LENGTH + U32.size
+FRAME_HEADER_LENGTH = NONCE_LENGTH + U32.size
+SEGMENT_AAD = b"\x00"
+FINAL_SEGMENT_AAD = b"\x01"
+
+# Temporary files are written next to their target, then renamed over it
+TEMP_PREFIX = ".lockstr-"
+TEMP_SUFFIX = ".tmp"
+
+# Per-file progress lines are only printed on a terminal for runs up to
+# this many files; bigger runs get a progress bar redrawn every interval
+PROGRESS_LINE_LIMIT = 1000
+PROGRESS_INTERVAL = 100
+
+# ProcessPoolExecutor refuses more workers than this on Windows
+# (WaitForMultipleObjects limit)
+WINDOWS_MAX_WORKERS = 61
+
+# Legacy Fernet token parameters (AES-128-CBC + HMAC-SHA256)
+IV_LENGTH = 16
+HMAC_LENGTH = 32
+FERNET_VERSION = b"\x80"
+FERNET_PREFIX_LENGTH = 9  # version + timestamp
+
 
 class CryptoError(Exception):
     """Custom exception for cryptographic operations"""
     pass
 
 
+def decode_key(key: bytes) -> bytes:
+    """Decode a base64 key into its 32 raw bytes (raises ValueError)"""
+    raw_key = base64.urlsafe_b64decode(key)
+    if len(raw_key) != 32:
+        raise ValueError("Key must be 32 url-safe base64-encoded bytes")
+    return raw_key
+
+
 class KeyManager:
-    """Handles Fernet key generation and validation"""
+    """Handles key generation and validation"""
     
     @staticmethod
-    def generate_key() -> bytes:
-        """Generate a new Fernet key and copy to clipboard"""
-        key = Fernet.generate_key()
+    def generate_key(sink: Optional[Callable[[str], None]] = None) -> bytes:
+        """
+        Generate a new 256-bit key and hand it (base64) to sink
+        The key goes to the clipboard unless another sink is given
+        """
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        
+        key = base64.urlsafe_b64encode(AESGCM.generate_key(bit_length=256))
+        (sink or KeyManager.copy_to_clipboard)(key.decode())
+        return key
+    
+    @staticmethod
+    def copy_to_clipboard(key: str) -> None:
+        """Key sink: copy to clipboard (spawns xclip/wl-copy on Linux)"""
+        import pyperclip
+        
         try:
-            pyperclip.copy(key.decode())
+            pyperclip.copy(key)
         except pyperclip.PyperclipException as e:
             print(f"⚠️  Could not copy to clipboard: {e}")
             raise CryptoError("Failed to copy key to clipboard")
-        return key
+    
+    @staticmethod
+    def fd_sink(fd: int) -> Callable[[str], None]:
+        """Key sink writing the key as one line to an open file descriptor"""
+        def write_key(key: str) -> None:
+            sys.stdout.flush()  # Keep ordering when fd is stdout
+            try:
+                os.write(fd, (key + "\n").encode())
+            except OSError as e:
+                raise CryptoError(f"Failed to write key to file descriptor {fd}: {e}")
+        
+        return write_key
     
     @staticmethod
     def get_key_from_user() -> bytes:
         """Get key from user input securely"""
+        from getpass import getpass
+        
         while True:
             key_input = getpass("Enter key: ")
             if not key_input:
@@ -58,59 +134,76 @@ class KeyManager:
             
             try:
                 key = key_input.encode()
-                Fernet(key)  # Validate key format
+                decode_key(key)  # Validate key format
                 return key
             except ValueError as e:
                 print(f"Invalid key format: {e}")
                 print("Please try again or press Ctrl+C to cancel")
+    
+    @staticmethod
+    def get_key_from_stdin() -> bytes:
+        """Read the key from the first line of standard input (for scripts)"""
+        key = sys.stdin.readline().strip().encode()
+        if not key:
+            raise CryptoError("No key received on standard input")
+        
+        try:
+            decode_key(key)  # Validate key format
+        except ValueError as e:
+            raise CryptoError(f"Invalid key format: {e}")
+        return key
 
 
 class FileProcessor:
     """Handles file encryption/decryption operations"""
     
     def __init__(self, key: bytes):
-        self.cipher = Fernet(key)
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        
+        raw_key = decode_key(key)
+        self.cipher = AESGCM(raw_key)
+        
+        # Legacy files: signing key (16 bytes) + encryption key (16 bytes)
+        self._signing_key = raw_key[:16]
+        self._encryption_key = raw_key[16:]
     
-    def process_file(self, file_path: Path, encrypt: bool = True) -> Tuple[bool, str]:
+    def process_file(self, file_path: Union[str, Path], encrypt: bool = True) -> Tuple[bool, str]:
         """
         Process a single file (encrypt or decrypt)
         Returns (success, error_message)
         """
+        # Plain strings from here on: no pathlib objects built per file
+        file_path = os.fspath(file_path)
+        
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            if encrypt:
-                # Check if already encrypted with lockstr
-                if data.startswith(MAGIC_HEADER):
-                    return False, "File is already encrypted with lockstr"
-                
-                encrypted_data = self.cipher.encrypt(data)
-                processed_data = MAGIC_HEADER + encrypted_data
+            with open(file_path, 'rb') as src:
+                header = src.read(MAGIC_LENGTH)
                 
-            else:
-                # Check if file has lockstr header
-                if not data.startswith(MAGIC_HEADER):
+                if encrypt:
+                    # Check if already encrypted with lockstr
+                    if header in (MAGIC_HEADER, LEGACY_MAGIC_HEADER):
+                        return False, "File is already encrypted with lockstr"
+                    
+                    src.seek(0)
+                    transform = self._encrypt_stream
+                    
+                elif header == MAGIC_HEADER:
+                    transform = self._decrypt_stream
+                    
+                elif header == LEGACY_MAGIC_HEADER:
+                    transform = self._decrypt_fernet
+                    
+                else:
                     return False, "File is not encrypted with lockstr (missing magic header)"
                 
-                # Remove header and decrypt
-                encrypted_payload = data[MAGIC_LENGTH:]
-                processed_data = self.cipher.decrypt(encrypted_payload)
-            
-            # Write to temporary file first
-            with tempfile.NamedTemporaryFile(
-                mode='wb',
-                dir=file_path.parent,
-                delete=False
-            ) as tmp:
-                tmp.write(processed_data)
-                tmp_path = Path(tmp.name)
+                tmp_path = self._write_temp(file_path, src, transform)
             
-            # Atomic replacement
-            os.replace(tmp_path, file_path)
+            # Replace only once the source is closed: Windows refuses to
+            # replace a file that is still open
+            self._replace(tmp_path, file_path)
             return True, ""
             
-        except InvalidToken as e:
+        except CryptoError as e:
             return False, f"Cryptographic error (wrong key or corrupted data): {e}"
         except PermissionError as e:
             return False, f"Permission denied: {e}"
@@ -118,41 +211,277 @@ class FileProcessor:
             return False, f"File too large for memory: {e}"
         except Exception as e:
             return False, f"Unexpected error: {e}"
+    
+    @staticmethod
+    def _write_temp(file_path: str, src: BinaryIO,
+                    transform: Callable[[BinaryIO, BinaryIO], None]) -> str:
+        """Run transform into a temporary file next to file_path and return its path"""
+        # Hidden name: leftovers are recognizable and skipped by the walker
+        fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, suffix=TEMP_SUFFIX,
+                                        dir=os.path.dirname(file_path) or os.curdir)
+        
+        try:
+            with open(fd, 'wb') as tmp:
+                transform(src, tmp)
+        except BaseException:
+            _discard(tmp_path)
+            raise
+        return tmp_path
+    
+    @staticmethod
+    def _replace(tmp_path: str, file_path: str) -> None:
+        """Atomically move a finished temporary file over file_path"""
+        try:
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            _discard(tmp_path)
+            raise
+    
+    def _encrypt_stream(self, src: BinaryIO, dst: BinaryIO) -> None:
+        """
+        Encrypt src into dst as a framed container, one frame per chunk
+        Layout: MAGIC || salt || chunk_size || (nonce || length || ciphertext || tag)...
+        """
+        salt = os.urandom(SALT_LENGTH)
+        dst.write(MAGIC_HEADER + salt + U32.pack(CHUNK_SIZE))
+        
+        with _map_input(src) as data:
+            size = len(data)
+            # An empty file still gets one (empty) final frame
+            for counter, offset in enumerate(range(0, max(size, 1), CHUNK_SIZE)):
+                end = min(offset + CHUNK_SIZE, size)
+                nonce = _segment_nonce(salt, counter)
+                length = U32.pack(end - offset)
+                aad = length + (FINAL_SEGMENT_AAD if end == size else SEGMENT_AAD)
+                
+                dst.write(nonce + length)
+                dst.write(self.cipher.encrypt(nonce, data[offset:end], aad))
+    
+    def _decrypt_stream(self, src: BinaryIO, dst: BinaryIO) -> None:
+        """
+        Decrypt a framed container written by _encrypt_stream
+        Every frame is verified on its own; only the last one may be
+        short, and it must be the one marked final
+        """
+        from cryptography.exceptions import InvalidTag
+        
+        start = MAGIC_LENGTH + CONTAINER_HEADER_LENGTH
+        
+        with _map_input(src) as data:
+            size = len(data)
+            if size < start:
+                raise CryptoError("truncated header")
+            salt = bytes(data[MAGIC_LENGTH:MAGIC_LENGTH + SALT_LENGTH])
+            chunk_size, = U32.unpack_from(data, MAGIC_LENGTH + SALT_LENGTH)
+            
+            offset = start
+            counter = 0
+            while True:
+                if offset + FRAME_HEADER_LENGTH > size:
+                    raise CryptoError("truncated frame")
+                
+                nonce = bytes(data[offset:offset + NONCE_LENGTH])
+                length, = U32.unpack_from(data, offset + NONCE_LENGTH)
+                body = offset + FRAME_HEADER_LENGTH
+                end = body + length + GCM_TAG_LENGTH
+                final = end >= size
+                
+                if (nonce != _segment_nonce(salt, counter) or length > chunk_size
+                        or end > size or (not final and length != chunk_size)):
+                    raise CryptoError("malformed frame")
+                
+                aad = U32.pack(length) + (FINAL_SEGMENT_AAD if final else SEGMENT_AAD)
+                try:
+                    dst.write(self.cipher.decrypt(nonce, data[body:end], aad))
+                except InvalidTag:
+                    raise CryptoError("authentication failed")
+                
+                if final:
+                    break
+                offset = end
+                counter += 1
+    
+    def _decrypt_fernet(self, src: BinaryIO, dst: BinaryIO) -> None:
+        """
+        Decrypt a file written as MAGIC || Fernet token by older versions
+        The base64 token is decoded chunk by chunk and checked in two
+        passes (HMAC first, so nothing is written for tampered data),
+        instead of being read whole
+        Token: 0x80 || timestamp(8) || IV(16) || ciphertext || HMAC(32)
+        """
+        from cryptography.hazmat.primitives import constant_time, hashes, hmac, padding
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        
+        size = os.fstat(src.fileno()).st_size
+        token_length = size - MAGIC_LENGTH
+        src.seek(size - 2)
+        data_length = token_length // 4 * 3 - src.read(2).count(b"=")
+        iv_start = FERNET_PREFIX_LENGTH
+        ciphertext_start = iv_start + IV_LENGTH
+        mac_length = data_length - HMAC_LENGTH
+        
+        if (token_length % 4 or mac_length <= ciphertext_start
+                or (mac_length - ciphertext_start) % (algorithms.AES.block_size // 8)):
+            raise CryptoError("invalid token length")
+        
+        # Pass 1: authenticate version || timestamp || IV || ciphertext,
+        # keeping the trailing HMAC from the same decode
+        mac = hmac.HMAC(self._signing_key, hashes.SHA256())
+        tag = b""
+        position = 0
+        for chunk in _fernet_range(src, 0, data_length):
+            signed = chunk[:max(0, mac_length - position)]
+            mac.update(signed)
+            tag += chunk[len(signed):]
+            position += len(chunk)
+        if not constant_time.bytes_eq(mac.finalize(), tag):
+            raise CryptoError("authentication failed")
+        
+        # Pass 2: decrypt
+        prefix = b"".join(_fernet_range(src, 0, ciphertext_start))
+        if prefix[:1] != FERNET_VERSION:
+            raise CryptoError("unsupported Fernet version")
+        
+        iv = prefix[iv_start:]
+        decryptor = Cipher(algorithms.AES(self._encryption_key), modes.CBC(iv)).decryptor()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        
+        for chunk in _fernet_range(src, ciphertext_start, mac_length):
+            dst.write(unpadder.update(decryptor.update(chunk)))
+        
+        dst.write(unpadder.update(decryptor.finalize()) + unpadder.finalize())
+
+
+def _discard(tmp_path: str) -> None:
+    """Remove a temporary file; never leave half-written ones behind"""
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+def _fernet_range(src: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    """Yield decoded bytes [start, end) of the Fernet token after the header"""
+    src.seek(MAGIC_LENGTH)
+    position = 0
+    
+    # CHUNK_SIZE is a multiple of 4, so every chunk decodes on its own
+    for encoded in iter(lambda: src.read(CHUNK_SIZE), b""):
+        try:
+            chunk = base64.urlsafe_b64decode(encoded)
+        except ValueError:
+            raise CryptoError("invalid token encoding")
+        
+        if position + len(chunk) > start:
+            yield chunk[max(0, start - position):end - position]
+        position += len(chunk)
+        if position >= end:
+            break
+
+
+@contextmanager
+def _map_input(src: BinaryIO) -> Iterator[memoryview]:
+    """
+    Map the whole input read-only so segments are sliced out of the page
+    cache without copies. Single-segment files are simply read: one read
+    is cheaper than mmap + page faults + munmap (and mmap rejects empty files)
+    """
+    if os.fstat(src.fileno()).st_size <= CHUNK_SIZE:
+        src.seek(0)
+        yield memoryview(src.read())
+        return
+    
+    with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as data:
+            yield data
+
+
+def _segment_nonce(salt: bytes, counter: int) -> bytes:
+    """Build the 96-bit GCM nonce for a segment"""
+    return salt + counter.to_bytes(4, 'big')
+
+
+# FileProcessor of the current worker process, built once by _init_worker
+_worker_processor = None
+
+
+def _init_worker(key: bytes) -> None:
+    """Worker initializer: set up the cipher (key schedule) once per process"""
+    global _worker_processor
+    _worker_processor = FileProcessor(key)
+
+
+def _process_worker(path_str: str, encrypt: bool) -> Tuple[bool, str]:
+    """Process one file in a worker process"""
+    return _worker_processor.process_file(path_str, encrypt)
 
 
 class DirectoryWalker:
     """Handles recursive directory traversal"""
     
     @staticmethod
-    def get_files(path: Path, include_hidden: bool = False) -> List[Path]:
+    def get_files(path: Path, include_hidden: bool = False,
+                  with_stat: bool = True) -> List[Tuple[Path, Optional[os.stat_result]]]:
         """
-        Get all files from a path (recursive if directory)
+        Get all files from a path (recursive if directory) with their stat
+        Uses os.scandir so file types come from the cached directory entry;
+        without with_stat no per-file stat call is made at all (stat is None)
         """
         files = []
         
         if path.is_file():
-            files.append(path)
+            files.append((path, path.stat() if with_stat else None))
         elif path.is_dir():
-            for item in path.rglob('*'):
-                if item.is_file() and not item.is_symlink():
-                    # Skip hidden files unless requested
-                    if not include_hidden and item.name.startswith('.'):
-                        continue
-                    files.append(item)
+            pending = [str(path)]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            # Skip hidden files and whole hidden directories
+                            # (.git/, .venv/, ...) unless requested
+                            if not include_hidden and entry.name.startswith('.'):
+                                continue
+                            
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False) if with_stat else None
+                                files.append((Path(entry.path), st))
+                except OSError:
+                    # Unreadable directories are skipped
+                    continue
         
         return files
     
     @staticmethod
-    def validate_files(files: List[Path]) -> Tuple[bool, List[str]]:
-        """Validate file access permissions"""
+    def validate_files(files: List[Tuple[Path, os.stat_result]]) -> Tuple[bool, List[str]]:
+        """
+        Validate file access permissions from the walker's stat results
+        Only mode bits are checked (no os.access probe per file), so ACLs
+        and read-only mounts are only caught when the file is processed
+        """
         errors = []
         
-        for file_path in files:
-            if not file_path.exists():
-                errors.append(f"File not found: {file_path}")
-            elif not os.access(file_path, os.R_OK):
+        if hasattr(os, 'geteuid'):
+            euid = os.geteuid()
+            groups = {os.getegid(), *os.getgroups()}
+        
+        for file_path, st in files:
+            if not hasattr(os, 'geteuid'):
+                # Windows: st_mode only reflects the read-only attribute
+                readable, writable = True, bool(st.st_mode & stat.S_IWRITE)
+            elif euid == 0:
+                readable, writable = True, True
+            elif st.st_uid == euid:
+                readable, writable = st.st_mode & stat.S_IRUSR, st.st_mode & stat.S_IWUSR
+            elif st.st_gid in groups:
+                readable, writable = st.st_mode & stat.S_IRGRP, st.st_mode & stat.S_IWGRP
+            else:
+                readable, writable = st.st_mode & stat.S_IROTH, st.st_mode & stat.S_IWOTH
+            
+            if not readable:
                 errors.append(f"Cannot read: {file_path}")
-            elif not os.access(file_path, os.W_OK):
+            elif not writable:
                 errors.append(f"Cannot write: {file_path}")
         
         return len(errors) == 0, errors
@@ -160,39 +489,26 @@ class DirectoryWalker:
     @staticmethod
     def display_file_tree(files: List[Path], base_path: Path) -> None:
         """Display files in a tree-like structure"""
-        from collections import defaultdict
-        
-        # Organize files by directory
-        dir_structure = defaultdict(list)
+        base = str(base_path if base_path.is_dir() else base_path.parent)
         
-        for file_path in files:
-            relative_path = file_path.relative_to(base_path)
-            parent = str(relative_path.parent)
-            if parent == ".":
-                parent = ""
-            dir_structure[parent].append(relative_path.name)
+        # (directory, name) string pairs sorted once, emitted in a single pass
+        entries = sorted(os.path.split(os.path.relpath(str(file_path), base)) for file_path in files)
         
-        # Sort and display
-        sorted_dirs = sorted(dir_structure.keys())
+        lines = ["\n📁 File structure to be processed:", "-" * 40]
+        current = None
         
-        print("\n📁 File structure to be processed:")
-        print("-" * 40)
-        
-        for i, directory in enumerate(sorted_dirs):
-            if directory:
-                print(f"📂 {directory}/")
-            else:
-                print("📂 . (current directory)")
-            
-            files_in_dir = sorted(dir_structure[directory])
-            for file_name in files_in_dir:
-                prefix = "  └── " if directory else "├── "
-                print(f"  {prefix}{file_name}")
+        for directory, file_name in entries:
+            if directory != current:
+                if current is not None:
+                    lines.append("")
+                lines.append(f"📂 {directory}/" if directory else "📂 . (current directory)")
+                current = directory
             
-            if i < len(sorted_dirs) - 1:
-                print("")
+            prefix = "  └── " if directory else "├── "
+            lines.append(f"  {prefix}{file_name}")
         
-        print("-" * 40)
+        lines.append("-" * 40)
+        print("\n".join(lines))
 
 
 class LockstrCLI:
@@ -203,13 +519,14 @@ class LockstrCLI:
     
     def _create_parser(self) -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser(
-            description=BANNER + "\nFile encryption/decryption tool using Fernet cryptography",
+            description=BANNER + "\nFile encryption/decryption tool using AES-256-GCM cryptography",
             formatter_class=argparse.RawDescriptionHelpFormatter,
             add_help=False,
             epilog="""
 ⚠️  IMPORTANT SECURITY NOTES:
 • The encryption key is NEVER displayed on screen
 • Keys are only copied to clipboard during encryption
+  (or written to --key-fd / --print-key when scripting)
 • Save your key in a secure password manager
 • Without the key, encrypted files are unrecoverable
 • Magic header prevents double-encryption accidents
@@ -220,6 +537,9 @@ class LockstrCLI:
   lockstr encrypt ./documents/ --dry-run
   lockstr encrypt ./backup/ --include-hidden --confirm
   lockstr decrypt ./encrypted/ --continue-on-error
+  lockstr encrypt ./backup/ --key-fd 3 3> backup.key
+  lockstr decrypt ./backup/ --key-stdin < backup.key
+  lockstr encrypt ./backup/ --print-key > backup.key
             """
         )
         
@@ -239,7 +559,7 @@ class LockstrCLI:
         parser.add_argument(
             '--include-hidden',
             action='store_true',
-            help='Include hidden files (starting with .)'
+            help='Include hidden files and directories (starting with .)'
         )
         parser.add_argument(
             '--continue-on-error',
@@ -251,11 +571,44 @@ class LockstrCLI:
             action='store_true',
             help='Show what would be processed without making changes'
         )
+        parser.add_argument(
+            '--no-preflight',
+            action='store_true',
+            help='Skip the up-front permission check (one stat less per file); '
+                 'access errors are then reported per file'
+        )
         parser.add_argument(
             '--confirm',
             action='store_true',
             help='Ask for confirmation before processing'
         )
+        parser.add_argument(
+            '-j', '--jobs',
+            type=int,
+            default=os.cpu_count() or 1,
+            metavar='N',
+            help='Number of files processed in parallel (default: CPU count, 1 = sequential)'
+        )
+        
+        # Scripted key handling (no clipboard, no prompt)
+        key_output = parser.add_mutually_exclusive_group()
+        key_output.add_argument(
+            '--key-fd',
+            type=int,
+            metavar='N',
+            help='Encrypt: write the new key to file descriptor N instead of the clipboard'
+        )
+        key_output.add_argument(
+            '--print-key',
+            action='store_true',
+            help='Encrypt: print only the new key to stdout instead of the clipboard '
+                 '(all other output goes to stderr)'
+        )
+        parser.add_argument(
+            '--key-stdin',
+            action='store_true',
+            help='Decrypt: read the key from the first line of stdin instead of prompting'
+        )
         parser.add_argument(
             '-h', '--help',
             action='help',
@@ -284,10 +637,70 @@ class LockstrCLI:
         response = input("Continue? [y/N]: ").strip().lower()
         return response in ('y', 'yes')
     
+    def process_files(self, files: List[Path], key: bytes, encrypt: bool,
+                      jobs: int, stop: threading.Event) -> Iterator[Tuple[Path, bool, str]]:
+        """
+        Yield (file_path, success, error_message) for each file
+        With jobs > 1 files are spread over worker processes and yielded
+        in completion order. Once stop is set no new file is started, but
+        files already in a worker are still yielded so they can be counted
+        """
+        if jobs <= 1 or len(files) == 1:
+            processor = FileProcessor(key)
+            for file_path in files:
+                if stop.is_set():
+                    return
+                yield (file_path, *processor.process_file(file_path, encrypt))
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        workers = min(jobs, len(files))
+        if sys.platform == 'win32':
+            workers = min(workers, WINDOWS_MAX_WORKERS)
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(key,)) as executor:
+            futures = {
+                executor.submit(_process_worker, str(file_path), encrypt): file_path
+                for file_path in files
+            }
+            try:
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    
+                    try:
+                        success, error_msg = future.result()
+                    except Exception as e:
+                        # e.g. BrokenProcessPool: a worker died mid-file
+                        success, error_msg = False, f"Worker process failed: {e}"
+                    yield futures[future], success, error_msg
+                    
+                    if stop.is_set():
+                        # Drop queued work; running files still complete
+                        for pending in futures:
+                            pending.cancel()
+            finally:
+                for future in futures:
+                    future.cancel()
+    
     def run(self) -> int:
         """Main execution flow"""
         args = self.parse_args()
         
+        if args.print_key:
+            # stdout carries only the key line; everything else (banner,
+            # prompts, progress, summary) goes to stderr so it can be captured
+            args.key_fd = sys.stdout.fileno()
+            with redirect_stdout(sys.stderr):
+                return self._run(args)
+        
+        return self._run(args)
+    
+    def _run(self, args: argparse.Namespace) -> int:
+        """Run the operation described by args"""
         print(BANNER)
         
         if not args.mode or not args.path:
@@ -295,14 +708,29 @@ class LockstrCLI:
             print(f"Usage: {sys.argv[0]} [encrypt|decrypt] <path>")
             return 1
         
+        is_encrypt = args.mode == 'encrypt'
+        
         target_path = Path(args.path)
         
         if not target_path.exists():
             print(f"Error: Path '{args.path}' does not exist")
             return 1
         
+        if args.jobs < 1:
+            print("Error: --jobs must be at least 1")
+            return 1
+        
+        if is_encrypt and args.key_stdin:
+            print("Error: --key-stdin is only valid for decrypt")
+            return 1
+        if not is_encrypt and args.key_fd is not None:
+            print("Error: --key-fd/--print-key are only valid for encrypt")
+            return 1
+        
         # Get files to process
-        files = DirectoryWalker.get_files(target_path, args.include_hidden)
+        entries = DirectoryWalker.get_files(target_path, args.include_hidden,
+                                            with_stat=not args.no_preflight)
+        files = [file_path for file_path, _ in entries]
         
         if not files:
             print(f"No valid files found at '{args.path}'")
@@ -318,13 +746,25 @@ class LockstrCLI:
             return 0
         
         # Validate file access
-        valid, errors = DirectoryWalker.validate_files(files)
-        if not valid:
-            print("Access errors found:")
-            for error in errors:
-                print(f"  {error}")
-            if not args.continue_on_error:
+        if not args.no_preflight:
+            valid, errors = DirectoryWalker.validate_files(entries)
+            if not valid:
+                print("Access errors found:")
+                for error in errors:
+                    print(f"  {error}")
+                if not args.continue_on_error:
+                    return 1
+        
+        # With --key-stdin the key is the first line of stdin, so it must be
+        # read before the confirmation prompt consumes a line
+        key = None
+        if args.key_stdin:
+            try:
+                key = KeyManager.get_key_from_stdin()
+            except CryptoError as e:
+                print(f"Error: {e}")
                 return 1
+            print("✓ Key accepted")
         
         # Ask for confirmation if requested
         if args.confirm and not self.confirm_operation(args.mode, len(files)):
@@ -332,14 +772,26 @@ class LockstrCLI:
             return 0
         
         # Get key
+        if args.print_key:
+            key_destination = "standard output"
+        elif args.key_fd is not None:
+            key_destination = f"file descriptor {args.key_fd}"
+        else:
+            key_destination = "your clipboard"
+        
         try:
-            if args.mode == 'encrypt':
+            if is_encrypt and args.key_fd is not None:
+                key = KeyManager.generate_key(KeyManager.fd_sink(args.key_fd))
+                print(f"\n✅ New key generated and written to {key_destination}")
+                print("⚠️  IMPORTANT: Save this key in a secure location!")
+                print("   Without it, your files will be permanently inaccessible.")
+            elif is_encrypt:
                 key = KeyManager.generate_key()
                 print("\n✅ New key generated and copied to clipboard")
                 print("⚠️  IMPORTANT: Save this key in a secure location!")
                 print("   Without it, your files will be permanently inaccessible.")
                 print("   The key is ONLY in your clipboard, not shown on screen.")
-            else:  # decrypt
+            elif key is None:  # decrypt
                 key = KeyManager.get_key_from_user()
                 print("✓ Key accepted")
         except CryptoError as e:
@@ -347,48 +799,66 @@ class LockstrCLI:
             return 1
         
         # Process files
-        processor = FileProcessor(key)
+        stop = threading.Event()
+        results = self.process_files(files, key, is_encrypt, args.jobs, stop)
         success_count = 0
         error_count = 0
         errors_list = []
         
-        print(f"\nProcessing {len(files)} file(s)...")
+        # Loop invariants
+        total = len(files)
+        
+        print(f"\nProcessing {total} file(s)...")
         print("-" * 40)
         
-        for i, file_path in enumerate(files, 1):
-            print(f"[{i}/{len(files)}] {file_path}", end="", flush=True)
-            
-            success, error_msg = processor.process_file(
-                file_path,
-                encrypt=(args.mode == 'encrypt')
-            )
-            
+        # Non-terminal output (logs, pipes) only gets failures and the summary
+        interactive = sys.stdout.isatty()
+        per_file = interactive and total <= PROGRESS_LINE_LIMIT
+        progress_bar = interactive and not per_file
+        bar_drawn = False
+        
+        for i, (file_path, success, error_msg) in enumerate(results, 1):
             if success:
-                print(" ✓")
                 success_count += 1
+                if per_file:
+                    print(f"[{i}/{total}] {file_path} ✓")
             else:
-                print(" ✗")
-                print(f"     Error: {error_msg}")
+                if bar_drawn:
+                    print()
+                    bar_drawn = False
+                print(f"[{i}/{total}] {file_path} ✗\n     Error: {error_msg}")
                 error_count += 1
                 errors_list.append((file_path, error_msg))
                 
                 if not args.continue_on_error:
-                    print(f"\n❌ Aborting due to error (use --continue-on-error to continue)")
-                    
-                    # Report partial results
-                    if success_count > 0:
-                        print(f"\nPartial operation completed:")
-                        print(f"  ✓ Successfully processed: {success_count} file(s)")
-                        print(f"  ✗ Failed: {error_count} file(s)")
-                        if args.mode == 'encrypt':
-                            print(f"  ⚠️  Some files may be encrypted, others not")
-                            print(f"  ⚠️  Manual intervention may be required")
-                    
-                    return 1
+                    # Keep consuming: files already running in workers are
+                    # still changed on disk and must be counted
+                    stop.set()
+            
+            if progress_bar and (i % PROGRESS_INTERVAL == 0 or i == total):
+                print(f"\r[{i}/{total}] files processed", end="", flush=True)
+                bar_drawn = True
+        
+        if bar_drawn:
+            print()
+        
+        if stop.is_set():
+            print(f"\n❌ Aborting due to error (use --continue-on-error to continue)")
+            
+            # Report partial results
+            if success_count > 0:
+                print(f"\nPartial operation completed:")
+                print(f"  ✓ Successfully processed: {success_count} file(s)")
+                print(f"  ✗ Failed: {error_count} file(s)")
+                if is_encrypt:
+                    print(f"  ⚠️  Some files may be encrypted, others not")
+                    print(f"  ⚠️  Manual intervention may be required")
+            
+            return 1
         
         # Report final results
         print(f"\n{'='*40}")
-        if args.mode == 'encrypt':
+        if is_encrypt:
             print(f"✅ ENCRYPTION COMPLETE")
             print(f"   • Files encrypted: {success_count}")
             print(f"   • Protected against double-encryption")
@@ -406,12 +876,16 @@ class LockstrCLI:
                 if len(errors_list) > 5:
                     print(f"   • ... and {len(errors_list) - 5} more")
         
-        if args.mode == 'encrypt':
+        if is_encrypt:
             print(f"\n🔑 KEY INFORMATION:")
-            print(f"   • Key was copied to your clipboard")
+            if args.key_fd is None:
+                print(f"   • Key was copied to your clipboard")
+            else:
+                print(f"   • Key was written to {key_destination}")
             print(f"   • Save it in a secure password manager")
             print(f"   • Without this key, files are PERMANENTLY inaccessible")
-            print(f"   • The key was NEVER displayed on screen")
+            if args.key_fd is None:
+                print(f"   • The key was NEVER displayed on screen")
         
         if error_count > 0 and not args.continue_on_error:
             return 1
@@ -425,7 +899,8 @@ def main():
     return cli.run()
 
 
-if __name__ == "__main__":
+def run_cli():
+    """Run main() with the command line exit handling (script and zipapp)"""
     try:
         sys.exit(main())
     except KeyboardInterrupt:
@@ -439,3 +914,7 @@ if __name__ == "__main__":
         print(f"\n💥 Unexpected error: {e}")
         print("   Please report this issue")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_cli()
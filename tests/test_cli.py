@@ -0,0 +1,150 @@
+"""
+Tests driving LockstrCLI.run end to end
+Run with: python -m unittest discover tests
+"""
+
+import io
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lockstr  # noqa: E402
+from cryptography.fernet import Fernet  # noqa: E402
+
+
+def run_cli(*argv, stdin=""):
+    """Run the CLI with argv and stdin text, returning (exit code, captured stdout)"""
+    out = io.StringIO()
+    with mock.patch.object(sys, 'argv', ['lockstr', *argv]), \
+            mock.patch.object(sys, 'stdin', io.StringIO(stdin)), redirect_stdout(out):
+        code = lockstr.LockstrCLI().run()
+    return code, out.getvalue()
+
+
+def _crash_on_marker(path_str, encrypt):
+    """Worker stand-in that kills its process on the marked file"""
+    if path_str.endswith('crash'):
+        os._exit(3)
+    return lockstr.FileProcessor(lockstr.base64.urlsafe_b64encode(bytes(32))).process_file(path_str, encrypt)
+
+
+class CLITestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.dir = self.root / "data"
+        self.dir.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_files(self, count, size=1000):
+        for i in range(count):
+            (self.dir / f"f{i}").write_bytes(os.urandom(size))
+
+    def encrypted_files(self):
+        return [p for p in self.dir.iterdir()
+                if p.read_bytes().startswith(lockstr.MAGIC_HEADER)]
+
+    def key_fd(self):
+        """Open a file for --key-fd, returning (fd, path)"""
+        path = self.root / "key"
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        self.addCleanup(os.close, fd)
+        return fd, path
+
+
+class AbortTest(CLITestCase):
+    """An aborted parallel run must count every file a worker changed"""
+
+    def test_abort_counts_running_workers(self):
+        self.make_files(40, size=200000)
+        pre_encrypted = self.dir / "f0"
+        lockstr.FileProcessor(Fernet.generate_key()).process_file(pre_encrypted, True)
+        fd, _ = self.key_fd()
+
+        code, out = run_cli('encrypt', str(self.dir), '-j', '2', '--key-fd', str(fd))
+
+        self.assertEqual(code, 1)
+        self.assertIn("Aborting due to error", out)
+        self.assertIn(f"{pre_encrypted} ✗", out)
+        match = re.search(r"Successfully processed: (\d+)", out)
+        reported = int(match.group(1)) if match else 0
+        # Everything encrypted on disk besides the pre-encrypted file was reported
+        self.assertEqual(len(self.encrypted_files()) - 1, reported)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         "patched worker is only inherited by forked processes")
+    def test_dead_worker_is_a_per_file_error(self):
+        self.make_files(6)
+        (self.dir / "crash").write_bytes(b"boom")
+        fd, _ = self.key_fd()
+
+        with mock.patch.object(lockstr, '_process_worker', _crash_on_marker):
+            code, out = run_cli('encrypt', str(self.dir), '-j', '2',
+                                '--key-fd', str(fd), '--continue-on-error')
+
+        self.assertEqual(code, 0)
+        self.assertNotIn("Unexpected error", out)
+        self.assertIn("Worker process failed", out)
+        self.assertRegex(out, r"Files failed: [1-9]")
+
+
+class KeyScriptingTest(CLITestCase):
+    """Scripted key handling: --print-key output feeds --key-stdin"""
+
+    def test_print_key_round_trip(self):
+        self.make_files(3)
+        before = {p.name: p.read_bytes() for p in self.dir.iterdir()}
+        stdout_path = self.root / "stdout"
+
+        # --print-key writes to the real stdout descriptor, so give it a file
+        err = io.StringIO()
+        with open(stdout_path, 'w+') as stdout, \
+                mock.patch.object(sys, 'argv', ['lockstr', 'encrypt', str(self.dir), '--print-key']), \
+                mock.patch.object(sys, 'stdout', stdout), redirect_stderr(err):
+            code = lockstr.LockstrCLI().run()
+        self.assertEqual(code, 0)
+        self.assertIn("ENCRYPTION COMPLETE", err.getvalue())
+        self.assertEqual(len(self.encrypted_files()), 3)
+
+        # stdout holds nothing but the key line
+        captured = stdout_path.read_text()
+        self.assertRegex(captured, r"\A[A-Za-z0-9_-]{43}=\n\Z")
+
+        code, _ = run_cli('decrypt', str(self.dir), '--key-stdin', stdin=captured)
+        self.assertEqual(code, 0)
+        self.assertEqual({p.name: p.read_bytes() for p in self.dir.iterdir()}, before)
+
+    def test_key_stdin_read_before_confirm(self):
+        data = b"secret"
+        path = self.dir / "f"
+        path.write_bytes(data)
+        key = Fernet.generate_key()
+        lockstr.FileProcessor(key).process_file(path, True)
+        sealed = path.read_bytes()
+
+        code, out = run_cli('decrypt', str(self.dir), '--key-stdin', '--confirm',
+                            stdin=f"{key.decode()}\nn\n")
+        self.assertEqual(code, 0)
+        self.assertIn("Operation cancelled", out)
+        self.assertEqual(path.read_bytes(), sealed)
+
+        code, out = run_cli('decrypt', str(self.dir), '--key-stdin', '--confirm',
+                            stdin=f"{key.decode()}\ny\n")
+        self.assertEqual(code, 0)
+        self.assertIn("Files decrypted: 1", out)
+        self.assertEqual(path.read_bytes(), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
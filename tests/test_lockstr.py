@@ -0,0 +1,140 @@
+"""
+Round-trip and tamper tests for the lockstr file formats
+Run with: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lockstr  # noqa: E402
+from cryptography.fernet import Fernet  # noqa: E402
+
+
+CHUNK = lockstr.CHUNK_SIZE
+SIZES = [0, 1, 100, CHUNK - 1, CHUNK, CHUNK + 1, 2 * CHUNK + 7]
+
+
+class FormatTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "file"
+        self.key = Fernet.generate_key()
+        self.processor = lockstr.FileProcessor(self.key)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertFails(self, encrypt=False):
+        """Processing must fail and leave the file (and directory) untouched"""
+        before = self.path.read_bytes()
+        success, error_msg = self.processor.process_file(self.path, encrypt)
+        self.assertFalse(success)
+        self.assertTrue(error_msg)
+        self.assertEqual(self.path.read_bytes(), before)
+        self.assertEqual(os.listdir(self.tmp.name), ["file"])
+
+    def encrypt(self, data):
+        self.path.write_bytes(data)
+        self.assertEqual(self.processor.process_file(self.path, True), (True, ""))
+        return self.path.read_bytes()
+
+
+class ContainerTest(FormatTestCase):
+    """LOCKSTR3 framed AES-GCM container"""
+
+    def test_round_trip(self):
+        for size in SIZES:
+            with self.subTest(size=size):
+                data = os.urandom(size)
+                sealed = self.encrypt(data)
+                self.assertTrue(sealed.startswith(lockstr.MAGIC_HEADER))
+                self.assertEqual(self.processor.process_file(self.path, False), (True, ""))
+                self.assertEqual(self.path.read_bytes(), data)
+
+    def test_refuses_double_encryption(self):
+        self.encrypt(b"secret")
+        self.assertFails(encrypt=True)
+
+    def test_refuses_plain_file(self):
+        self.path.write_bytes(b"not encrypted")
+        self.assertFails()
+
+    def test_wrong_key(self):
+        self.encrypt(b"secret")
+        self.processor = lockstr.FileProcessor(Fernet.generate_key())
+        self.assertFails()
+
+    def test_tampered_byte(self):
+        sealed = self.encrypt(os.urandom(2 * CHUNK + 7))
+        header = lockstr.MAGIC_LENGTH + lockstr.CONTAINER_HEADER_LENGTH
+        for offset in (lockstr.MAGIC_LENGTH, header, header + 100, len(sealed) - 1):
+            with self.subTest(offset=offset):
+                tampered = bytearray(sealed)
+                tampered[offset] ^= 1
+                self.path.write_bytes(tampered)
+                self.assertFails()
+
+    def test_truncated(self):
+        sealed = self.encrypt(os.urandom(2 * CHUNK + 7))
+        frame = lockstr.FRAME_HEADER_LENGTH + CHUNK + lockstr.GCM_TAG_LENGTH
+        header = lockstr.MAGIC_LENGTH + lockstr.CONTAINER_HEADER_LENGTH
+        # Cut on a frame boundary (dropped final frame), mid-frame and mid-header
+        for length in (header + frame, header + 2 * frame, len(sealed) - 1, header - 1):
+            with self.subTest(length=length):
+                self.path.write_bytes(sealed[:length])
+                self.assertFails()
+
+    def test_reordered_frames(self):
+        sealed = self.encrypt(os.urandom(3 * CHUNK))
+        frame = lockstr.FRAME_HEADER_LENGTH + CHUNK + lockstr.GCM_TAG_LENGTH
+        header = lockstr.MAGIC_LENGTH + lockstr.CONTAINER_HEADER_LENGTH
+        first, second = sealed[header:header + frame], sealed[header + frame:header + 2 * frame]
+        self.path.write_bytes(sealed[:header] + second + first + sealed[header + 2 * frame:])
+        self.assertFails()
+
+
+class LegacyFernetTest(FormatTestCase):
+    """LOCKSTR1 files written by older versions (magic header + Fernet token)"""
+
+    def write_legacy(self, data):
+        token = lockstr.LEGACY_MAGIC_HEADER + Fernet(self.key).encrypt(data)
+        self.path.write_bytes(token)
+        return token
+
+    def test_decrypt(self):
+        for size in SIZES:
+            with self.subTest(size=size):
+                data = os.urandom(size)
+                self.write_legacy(data)
+                self.assertEqual(self.processor.process_file(self.path, False), (True, ""))
+                self.assertEqual(self.path.read_bytes(), data)
+
+    def test_refuses_double_encryption(self):
+        self.write_legacy(b"secret")
+        self.assertFails(encrypt=True)
+
+    def test_tampered(self):
+        token = self.write_legacy(os.urandom(CHUNK))
+        for offset in (lockstr.MAGIC_LENGTH + 40, len(token) // 2, len(token) - 10):
+            with self.subTest(offset=offset):
+                tampered = bytearray(token)
+                tampered[offset] = ord("A") if tampered[offset] != ord("A") else ord("B")
+                self.path.write_bytes(tampered)
+                self.assertFails()
+
+    def test_truncated(self):
+        token = self.write_legacy(os.urandom(1000))
+        for length in (len(token) - 1, len(token) - 4, lockstr.MAGIC_LENGTH + 8):
+            with self.subTest(length=length):
+                self.path.write_bytes(token[:length])
+                self.assertFails()
+
+
+if __name__ == "__main__":
+    unittest.main()
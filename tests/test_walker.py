@@ -0,0 +1,121 @@
+"""
+Tests for DirectoryWalker traversal and the permission preflight
+Run with: python -m unittest discover tests
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lockstr import DirectoryWalker  # noqa: E402
+
+
+UID, GID, OTHER = 1000, 1000, 2000
+NESTED = os.path.join("sub", "nested.txt")
+
+
+def fake_stat(mode, uid=UID, gid=GID):
+    """stat_result for a regular file with the given permission bits"""
+    return os.stat_result((stat.S_IFREG | mode, 0, 0, 1, uid, gid, 0, 0, 0, 0))
+
+
+@unittest.skipUnless(hasattr(os, 'geteuid'), "POSIX permission model")
+class ValidateFilesTest(unittest.TestCase):
+
+    def validate(self, st, euid=UID, groups=()):
+        with mock.patch.object(os, 'geteuid', return_value=euid), \
+                mock.patch.object(os, 'getegid', return_value=GID if euid == UID else OTHER), \
+                mock.patch.object(os, 'getgroups', return_value=list(groups)):
+            return DirectoryWalker.validate_files([(Path("f"), st)])
+
+    def test_owner(self):
+        self.assertEqual(self.validate(fake_stat(0o600)), (True, []))
+        self.assertEqual(self.validate(fake_stat(0o400)), (False, ["Cannot write: f"]))
+        self.assertEqual(self.validate(fake_stat(0o200)), (False, ["Cannot read: f"]))
+        # Group and other bits do not apply to the owner
+        self.assertFalse(self.validate(fake_stat(0o066))[0])
+
+    def test_group(self):
+        st = fake_stat(0o060, uid=OTHER)
+        self.assertEqual(self.validate(st), (True, []))
+        self.assertEqual(self.validate(fake_stat(0o040, uid=OTHER)), (False, ["Cannot write: f"]))
+        # Supplementary groups count as well
+        self.assertEqual(self.validate(fake_stat(0o060, uid=OTHER, gid=OTHER + 1),
+                                       euid=OTHER + 2, groups=[OTHER + 1]), (True, []))
+
+    def test_other(self):
+        st = fake_stat(0o006, uid=OTHER, gid=OTHER)
+        self.assertEqual(self.validate(st), (True, []))
+        self.assertEqual(self.validate(fake_stat(0o004, uid=OTHER, gid=OTHER)),
+                         (False, ["Cannot write: f"]))
+
+    def test_no_permission(self):
+        self.assertEqual(self.validate(fake_stat(0o000)), (False, ["Cannot read: f"]))
+        self.assertEqual(self.validate(fake_stat(0o000, uid=OTHER, gid=OTHER)),
+                         (False, ["Cannot read: f"]))
+
+    def test_root_is_always_allowed(self):
+        self.assertEqual(self.validate(fake_stat(0o000, uid=OTHER, gid=OTHER), euid=0), (True, []))
+
+
+class GetFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "sub").mkdir()
+        (self.root / "top.txt").write_text("a")
+        (self.root / "sub" / "nested.txt").write_text("b")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def names(self, **kwargs):
+        return sorted(os.path.relpath(path, self.root)
+                      for path, _ in DirectoryWalker.get_files(self.root, **kwargs))
+
+    def test_recursive_with_stat(self):
+        files = DirectoryWalker.get_files(self.root)
+        self.assertEqual(self.names(), [NESTED, "top.txt"])
+        for path, st in files:
+            self.assertEqual(st.st_size, path.stat().st_size)
+
+    def test_without_stat(self):
+        self.assertTrue(all(st is None for _, st in
+                            DirectoryWalker.get_files(self.root, with_stat=False)))
+
+    def test_single_file(self):
+        path = self.root / "top.txt"
+        self.assertEqual([p for p, _ in DirectoryWalker.get_files(path)], [path])
+
+    def test_hidden_entries_skipped_by_default(self):
+        (self.root / ".git").mkdir()
+        (self.root / ".git" / "config").write_text("x")
+        (self.root / "sub" / ".hidden").write_text("y")
+
+        self.assertEqual(self.names(), [NESTED, "top.txt"])
+        self.assertEqual(self.names(include_hidden=True),
+                         sorted([os.path.join(".git", "config"), os.path.join("sub", ".hidden"),
+                                 NESTED, "top.txt"]))
+
+    def test_symlinks_not_followed(self):
+        outside = tempfile.TemporaryDirectory()
+        self.addCleanup(outside.cleanup)
+        (Path(outside.name) / "outside.txt").write_text("c")
+        try:
+            os.symlink(outside.name, self.root / "linked_dir", target_is_directory=True)
+            os.symlink(self.root / "top.txt", self.root / "linked_file")
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks not supported")
+
+        self.assertEqual(self.names(), [NESTED, "top.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()